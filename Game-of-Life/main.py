@@ -1,6 +1,6 @@
 import argparse
 import json
-import math
+import numpy
 import pathlib
 import pygame
 import tkinter
@@ -8,94 +8,12 @@ import tkinter.filedialog
 
 from colors import Colors
 from engine import Engine
-from enum import Enum
 from typing import Union
 
-
-class CellStatus(Enum):
-    ALIVE = 1
-    DEAD = 0
-
-
-class Cell:
-
-    """This cell class is used to store information about each one of cells and perform operations
-
-    Attributes:
-        cell_size (tuple[int, int]): The size of cell
-        cell_x (int): The x position of the cell (The position is relative to other cells
-        not to be messed with pixel position)
-        cell_y (int): The y position of the cell (The position is relative to other cells
-        not to be messed with pixel position
-        game (GameOfLife): The game class that inherits engine
-        rect (pygame.Rect): The pygame rectangle object used to store height,width,x,y
-        status (CellStatus): The status of current cell determined by CellStatus enum class
-    """
-
-    def __init__(
-        self,
-        cell_x: int,
-        cell_y: int,
-        cell_size: tuple[int, int],
-        status: CellStatus,
-        game,
-    ):
-        self.game = game
-        self.cell_x = cell_x
-        self.cell_y = cell_y
-        self.status = status
-        self.cell_size = cell_size
-        self.rect = pygame.Rect(
-            cell_x * cell_size[0],
-            cell_y * cell_size[1],
-            cell_size[0] - 1,
-            cell_size[0] - 1,
-        )
-
-    def toggle(self) -> None:
-        """Toggle the status of cell, if its alive it becomes dead and vice versa"""
-        self.status = {
-            CellStatus.ALIVE: CellStatus.DEAD,
-            CellStatus.DEAD: CellStatus.ALIVE,
-        }[self.status]
-
-    def copy(self):
-        """Returns the copy of itself
-
-        Returns:
-            Cell: The copy of itself
-        """
-        return Cell(self.cell_x, self.cell_y, self.cell_size, self.status, self.game)
-
-    def get_neighbors_count(self) -> int:
-        """Calculates the amount of alive neighbors
-
-        Returns:
-            int: The amount of alive neighbors
-        """
-        neighbor_count = 0
-
-        # Top
-        neighbor_count += self.game.get_cell_status(self.cell_x - 1, self.cell_y)
-        # Top-left
-        neighbor_count += self.game.get_cell_status(self.cell_x - 1, self.cell_y - 1)
-        # Top-right
-        neighbor_count += self.game.get_cell_status(self.cell_x - 1, self.cell_y + 1)
-        # Left
-        neighbor_count += self.game.get_cell_status(self.cell_x, self.cell_y - 1)
-        # Right
-        neighbor_count += self.game.get_cell_status(self.cell_x, self.cell_y + 1)
-        # Bottom
-        neighbor_count += self.game.get_cell_status(self.cell_x + 1, self.cell_y)
-        # Bottom-left
-        neighbor_count += self.game.get_cell_status(self.cell_x + 1, self.cell_y - 1)
-        # Bottom-right
-        neighbor_count += self.game.get_cell_status(self.cell_x + 1, self.cell_y + 1)
-
-        return neighbor_count
-
-    def __repr__(self):
-        return f"Cell({self.status})"
+# Cell statuses are plain ints so they can live in the status array and be
+# compared/toggled with integer arithmetic instead of enum and dict lookups
+ALIVE = 1
+DEAD = 0
 
 
 class GameOfLife(Engine):
@@ -108,12 +26,41 @@ class GameOfLife(Engine):
         self.since_last_evoulate = 0
         self.running_evolution = False
         self.last_changed_cell = None
+        self.drawn_status = None
+        self.caption = None
 
         if "loaded_board" in self.configs:
-            self.board = self.get_loadable_board(self.configs["loaded_board"])
+            self.status = self.get_loadable_board(self.configs["loaded_board"])
         else:
-            self.board = []
-            self.init_board()
+            self.status = numpy.zeros(
+                (
+                    self.screen_size[0] // self.cell_size[0],
+                    self.screen_size[1] // self.cell_size[1],
+                ),
+                dtype=numpy.uint8,
+            )
+        self.init_board()
+        # The zero border of this buffer is what keeps edge neighbors dead, only the
+        # center gets rewritten each evoulate so the padding never has to be rebuilt
+        self.padded_status = numpy.zeros(
+            (self.status.shape[0] + 2, self.status.shape[1] + 2), dtype=numpy.uint8
+        )
+        # Scratch buffers for evoulate, the next statuses are written into next_status
+        # which then swaps places with the current status array every generation
+        self.neighbor_counts = numpy.zeros(self.status.shape, dtype=numpy.uint8)
+        self.next_status = numpy.zeros(self.status.shape, dtype=numpy.uint8)
+        # All cell drawing happens on this surface, the display only ever gets blits of it
+        self.board_surface = pygame.Surface(self.screen_size).convert()
+        self.board_surface.fill(Colors.GRAY)
+        # Prebuilt cell images indexed by status, so changed cells can be pushed onto
+        # the board surface in one batched fblits call instead of one fill per cell
+        self.cell_images = []
+        for color in (Colors.RAYWHITE, Colors.BLACK):
+            image = pygame.Surface(
+                (self.cell_size[0] - 1, self.cell_size[1] - 1)
+            ).convert()
+            image.fill(color)
+            self.cell_images.append(image)
 
         icon = pygame.image.load(
             pathlib.Path(__file__).parent.parent.joinpath("assets/icon.png")
@@ -124,11 +71,23 @@ class GameOfLife(Engine):
         pygame.event.set_allowed([pygame.QUIT, pygame.KEYUP])
 
     def init_board(self) -> None:
-        """If the progarm is not in a loaded state creates each cell with defautl statues of DEAD"""
-        for x in range(self.screen_size[0] // self.cell_size[0]):
-            self.board.append([])
-            for y in range(self.screen_size[1] // self.cell_size[1]):
-                self.board[x].append(Cell(x, y, self.cell_size, CellStatus.DEAD, self))
+        """Precomputes the pygame rectangle of every cell, the rectangles only depend on the
+        cell positions and size so they are built one time and reused on every draw
+
+        The rectangles live in one flat list in the same row-major order as the status
+        array, the rectangle of cell (x, y) sits at index `x * board_height + y`
+        """
+        self.rects = []
+        for x in range(self.status.shape[0]):
+            for y in range(self.status.shape[1]):
+                self.rects.append(
+                    pygame.Rect(
+                        x * self.cell_size[0],
+                        y * self.cell_size[1],
+                        self.cell_size[0] - 1,
+                        self.cell_size[1] - 1,
+                    )
+                )
 
     def check_events(self) -> None:
         """Checks for space/c clicks to run/clear the board"""
@@ -148,27 +107,34 @@ class GameOfLife(Engine):
         """Updates the game caption with new info, checks evoulate timer to run evoulate if needed and
         if the program is in edit state allows the user to edit cells with mouse
         """
-        pygame.display.set_caption(
+        caption = (
             f"Conway's Game Of Life | "
             + f"{'Evoulating' if self.running_evolution else 'Paused'} | "
             + f"FPS: {round(self.clock.get_fps())}"
         )
+        # set_caption goes through the window manager, only call it on actual changes
+        if caption != self.caption:
+            pygame.display.set_caption(caption)
+            self.caption = caption
         if self.running_evolution:
             self.since_last_evoulate += self.last_tick_time
-            if self.since_last_evoulate >= self.evoulate_timer_ms:
-                self.since_last_evoulate = 0
+            # After a long stall (window drag etc...) drop the backlog instead of
+            # trying to catch up with a burst of generations
+            if self.since_last_evoulate > self.evoulate_timer_ms * 4:
+                self.since_last_evoulate = self.evoulate_timer_ms * 4
+            while self.since_last_evoulate >= self.evoulate_timer_ms:
+                self.since_last_evoulate -= self.evoulate_timer_ms
                 self.evoulate()
         else:
             lmb_pressed = pygame.mouse.get_pressed()[0]
             if lmb_pressed:
                 mouse_pos = pygame.mouse.get_pos()
                 clicked_cell_pos = (
-                    math.floor(mouse_pos[0] / self.cell_size[0]),
-                    math.floor(mouse_pos[1] / self.cell_size[1]),
+                    mouse_pos[0] // self.cell_size[0],
+                    mouse_pos[1] // self.cell_size[1],
                 )
                 if self.last_changed_cell != clicked_cell_pos:
-                    clicked_cell = self.board[clicked_cell_pos[0]][clicked_cell_pos[1]]
-                    clicked_cell.toggle()
+                    self.status[clicked_cell_pos] ^= 1
                     self.last_changed_cell = clicked_cell_pos
 
             pressed_keys = pygame.key.get_pressed()
@@ -179,48 +145,37 @@ class GameOfLife(Engine):
                     self.load_state_file()
 
     def draw(self) -> None:
-        """Draws the cells into screen"""
-        self.display.fill(Colors.GRAY)
-
-        self.draw_cells()
-
-        pygame.display.flip()
+        """Draws the board surface into screen, only the regions that changed get pushed"""
+        if self.drawn_status is None:
+            self.draw_cells()
+            self.display.blit(self.board_surface, (0, 0))
+            pygame.display.flip()
+        else:
+            dirty_rects = self.draw_cells()
+            if dirty_rects:
+                for rect in dirty_rects:
+                    self.display.blit(self.board_surface, rect, rect)
+                pygame.display.update(dirty_rects)
 
     def get_saveable_board(self) -> list[list[int]]:
-        """Returns a 2 Dimensional list of itself changing the cell classes to 1 and 0 so
-        it's valid to save
+        """Returns the board statuses as a 2 dimensional list of 1 and 0 so it's valid to save
 
         Returns:
             list[list[int]]: The 2 dimensional list in 1,0 format
         """
-        return [
-            [{CellStatus.DEAD: 0, CellStatus.ALIVE: 1}[cell.status] for cell in row]
-            for row in self.board
-        ]
+        return self.status.tolist()
 
-    def get_loadable_board(self, config_json: list[list[int]]) -> list[list[Cell]]:
-        """Returns a display-able board, changes all 1,0 to valid Cell objects
+    def get_loadable_board(self, config_json: list[list[int]]) -> numpy.ndarray:
+        """Returns a display-able board, changes the saved 2 dimensional list of 1,0 back
+        into the status array
 
         Args:
             config_json (list[list[int]]): 2 dimensional list containing 1,0
 
         Returns:
-            list[list[Cell]]: Converted 2 dimensional list 1,0 to valid Cell objects
+            numpy.ndarray: The 2 dimensional uint8 status array
         """
-        new_board = []
-        for x, row in enumerate(config_json):
-            new_board.append([])
-            for y, cell in enumerate(row):
-                new_board[x].append(
-                    Cell(
-                        x,
-                        y,
-                        self.cell_size,
-                        {0: CellStatus.DEAD, 1: CellStatus.ALIVE}[cell],
-                        self,
-                    )
-                )
-        return new_board
+        return numpy.array(config_json, dtype=numpy.uint8)
 
     def unpack_state(self, config_json: dict[str, Union[int, list[list[int]]]]) -> None:
         """Unpacks the loaded config_json file and passes it into the new GameOfLife object
@@ -274,9 +229,7 @@ class GameOfLife(Engine):
 
     def clear_board(self) -> None:
         """Clears the baord and makes all cell's dead"""
-        for row in self.board:
-            for cell in row:
-                cell.status = CellStatus.DEAD
+        self.status.fill(DEAD)
 
     def get_cell_status(self, cell_x: int, cell_y: int) -> int:
         """Gets the status of requested cell and returns it as 1,0 (Also returns 0 if the requested
@@ -289,39 +242,94 @@ class GameOfLife(Engine):
         Returns:
             int: 1 if cell is alive 0 if its dead or position is invalid
         """
-        try:
-            return {CellStatus.ALIVE: 1, CellStatus.DEAD: 0}[
-                self.board[cell_x][cell_y].status
-            ]
-        except IndexError:
-            return 0
-
-    def draw_cells(self) -> None:
-        """Draw's each one of the cells into screen with colors"""
-        for row in self.board:
-            for cell in row:
-                cell_color = {
-                    CellStatus.ALIVE: Colors.BLACK,
-                    CellStatus.DEAD: Colors.RAYWHITE,
-                }[cell.status]
-
-                pygame.draw.rect(
-                    self.display,
-                    cell_color,
-                    cell.rect,
-                )
+        if 0 <= cell_x < self.status.shape[0] and 0 <= cell_y < self.status.shape[1]:
+            return int(self.status[cell_x, cell_y])
+        return 0
+
+    def draw_cells(self) -> list[pygame.Rect]:
+        """Draw's the cells whose status changed since the last frame into the board surface
+
+        The statuses drawn on the previous frame are kept around so only the difference
+        has to be drawn, the changed cells get their prebuilt status image pushed onto
+        the board surface in one batched fblits call
+
+        Returns:
+            list[pygame.Rect]: The rectangles of the cells that got redrawn
+        """
+        if self.drawn_status is None:
+            # First frame after starting or loading a state, every cell is drawn at once
+            self.render_full_board()
+            self.drawn_status = self.status.copy()
+            return []
+        changed_cells = numpy.argwhere(self.status != self.drawn_status)
+
+        # Locals are a plain array load in CPython while the attribute lookups
+        # would cost a dict probe on every cell of the loop
+        status = self.status
+        rects = self.rects
+        cell_images = self.cell_images
+        board_height = self.status.shape[1]
+
+        dirty_rects = []
+        blit_sequence = []
+        for x, y in changed_cells:
+            rect = rects[x * board_height + y]
+            blit_sequence.append((cell_images[status[x, y]], rect))
+            dirty_rects.append(rect)
+        self.board_surface.fblits(blit_sequence)
+
+        self.drawn_status = self.status.copy()
+        return dirty_rects
+
+    def render_full_board(self) -> None:
+        """Rasterizes every cell into the board surface in one vectorized step
+
+        The statuses index into a color table, get expanded to cell size with
+        numpy.repeat and are written straight into the surface pixels through
+        pygame.surfarray, the one pixel gap between the cells is restored by
+        overwriting the last pixel row/column of every cell with the background
+        """
+        cell_colors = numpy.array([Colors.RAYWHITE, Colors.BLACK], dtype=numpy.uint8)
+        board_pixels = (
+            cell_colors[self.status]
+            .repeat(self.cell_size[0], axis=0)
+            .repeat(self.cell_size[1], axis=1)
+        )
+        board_pixels[self.cell_size[0] - 1 :: self.cell_size[0], :] = Colors.GRAY
+        board_pixels[:, self.cell_size[1] - 1 :: self.cell_size[1]] = Colors.GRAY
+
+        pixels = pygame.surfarray.pixels3d(self.board_surface)
+        pixels[: board_pixels.shape[0], : board_pixels.shape[1]] = board_pixels
+        # The pixel array locks the surface, it has to go away before any blit
+        del pixels
 
     def evoulate(self) -> None:
-        """Evoulates the board into it next state, the main part of conway's game of life"""
-        next_level_board = [[cell.copy() for cell in row] for row in self.board]
-        for x, row in enumerate(self.board):
-            for y, cell in enumerate(row):
-                neighbor_count = cell.get_neighbors_count()
-                if cell.status == CellStatus.ALIVE and (not neighbor_count in (2, 3)):
-                    next_level_board[x][y].toggle()
-                elif cell.status == CellStatus.DEAD and neighbor_count in (3,):
-                    next_level_board[x][y].toggle()
-        self.board = next_level_board
+        """Evoulates the board into it next state, the main part of conway's game of life
+
+        The whole board is evoulated at once with numpy: the neighbor counts are the sum
+        of the 8 shifted slices of the zero-padded status array (so edges don't wrap around)
+        and the next statuses come from the conway rules as boolean masks
+        `(n == 3) | (alive & (n == 2))`
+        """
+        state = self.status
+        padded = self.padded_status
+        padded[1:-1, 1:-1] = state
+
+        neighbor_counts = self.neighbor_counts
+        numpy.add(padded[:-2, :-2], padded[:-2, 1:-1], out=neighbor_counts)
+        neighbor_counts += padded[:-2, 2:]
+        neighbor_counts += padded[1:-1, :-2]
+        neighbor_counts += padded[1:-1, 2:]
+        neighbor_counts += padded[2:, :-2]
+        neighbor_counts += padded[2:, 1:-1]
+        neighbor_counts += padded[2:, 2:]
+
+        next_status = self.next_status
+        next_status[:] = (neighbor_counts == 3) | (
+            (neighbor_counts == 2) & (state == ALIVE)
+        )
+        self.next_status = state
+        self.status = next_status
 
 
 def get_args_config() -> argparse.Namespace: